@@ -1,26 +1,295 @@
 #!/usr/bin/env python
 import socket
-import ssl
 import re
 import argparse
-import sys
 import html
+import codecs
+import io
 import urllib.parse
 import os
 import json
-import hashlib
 import time
-from urllib.parse import urlparse, parse_qs
-from datetime import datetime, timedelta
+import zlib
+import select
+import threading
+from urllib.parse import urlparse
+
+# ssl, hashlib, datetime and concurrent.futures are imported where they are
+# used, so that paths which don't need them (such as -h) start faster
+
+try:
+    # Optional, enables Brotli compressed responses when installed
+    import brotli
+except ImportError:
+    brotli = None
+
+# Size of a single recv() call; large reads keep the socket/SSL layers from
+# being syscall-bound on big pages
+RECV_BUFFER_SIZE = 65536
+
+# Idle keep-alive connections older than this (in seconds) are not reused
+POOL_IDLE_TIMEOUT = 30
+
+# Resolved host addresses are reused for this many seconds
+DNS_CACHE_TTL = 60
+
+# Accept header used for requests and cache keys unless the caller negotiates a content type
+DEFAULT_ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+
+# Content codings the client can decompress
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+# Headers sent with every request unless the caller provides them
+DEFAULT_HEADERS = (
+    ("User-Agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"),
+    ("Accept", "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"),
+    ("Accept-Encoding", ACCEPT_ENCODING),
+    ("Connection", "keep-alive"),
+)
+
+# Maximum number of pages fetched at the same time when opening several results
+FETCH_CONCURRENCY = 8
+
+# Markup removed from HTML pages: head, script and style elements with their
+# contents, and any other tag
+_MARKUP_RE = re.compile(r'<(head|script|style)\b[^>]*>.*?</\1\s*>|<[^>]+>', re.DOTALL | re.IGNORECASE)
+# Longest prefix of a partially received page that ends outside any markup. A
+# head, script or style start tag on its own ends the prefix, as the end of
+# the element hasn't been received yet
+_COMPLETE_MARKUP_RE = re.compile(r'(?:[^<]+|<(head|script|style)\b[^>]*>.*?</\1\s*>'
+                                 r'|<(?!(?:head|script|style)\b)[^>]+>|<(?=>))*', re.DOTALL | re.IGNORECASE)
+# Start tag of an element whose contents are stripped along with it, the end
+# tag of each such element, and the end of any other tag
+_RAW_TEXT_START_RE = re.compile(r'<(head|script|style)\b[^>]*>', re.IGNORECASE)
+_RAW_TEXT_END_RES = {name: re.compile(rf'</{name}\s*>', re.IGNORECASE) for name in ('head', 'script', 'style')}
+_TAG_END_RE = re.compile('>')
+# Character reference that may continue in the next piece of a page
+_PARTIAL_ENTITY_RE = re.compile(r'&#?\w*')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Status line of the raw header bytes, the empty line ending a header block
+# (a bare LF is accepted as a line terminator), and max-age inside a
+# Cache-Control value
+_STATUS_RE = re.compile(rb'HTTP/[\d.]+\s+(\d+)')
+_HEADER_END_RE = re.compile(rb'\r?\n\r?\n')
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)', re.IGNORECASE)
+
+# Search result pages
+# Anchor with an absolute href; the title is matched as an unrolled loop of
+# text and tags other than <a> and </a>, so an anchor without a closing tag
+# ends its title at the next anchor instead of scanning the rest of the page
+_DDG_LINK_RE = re.compile(r'<a\b[^>]*\bhref="(https?://[^"]+)"[^>]*>([^<]*(?:<(?!/?a\b)[^<]*)*)</a\s*>',
+                          re.IGNORECASE)
+_GOOGLE_LINK_RE = re.compile(r'<a href="(/url\?q=|)(https?://(?!google\.com).*?)(?:&amp;|")')
+_GOOGLE_TITLE_RE = re.compile(r'<h3[^>]*>(.*?)</h3>')
+_RESULT_URL_RE = re.compile(r'URL: (https?://.*?)$', re.MULTILINE)
+
+
+def parse_status(headers):
+    """Return the status code from the status line of a raw header block, or None"""
+    status_match = _STATUS_RE.match(headers)
+    return int(status_match.group(1)) if status_match else None
+
+
+def parse_headers(headers):
+    """Parse a raw header block into a dict keyed by lowercase field name.
+
+    Repeated fields are combined into a single comma-separated value.
+    """
+    fields = {}
+    # The first line is the status line, a trailing CR is stripped with the value
+    for line in headers.split(b'\n')[1:]:
+        name, separator, value = line.partition(b':')
+        if not separator:
+            continue
+        name = name.strip().decode('latin-1').lower()
+        value = value.strip().decode('latin-1')
+        if name in fields:
+            fields[name] += ', ' + value
+        else:
+            fields[name] = value
+    return fields
+
+
+class ResponseParser:
+    """Incremental parser for the framing of a single HTTP/1.1 response.
+
+    Received data is appended to the parser's buffer and the parser works out
+    where the message ends from Content-Length, chunked transfer coding
+    (RFC 7230 section 4.1) or the connection closing. Bytes after the end of
+    the message are left in the buffer.
+    """
+
+    def __init__(self, method="GET", data=b''):
+        self.method = method
+        self.buffer = bytearray(data)
+        self.state = 'headers'
+        self.headers = None
+        self.status_code = None
+        self.fields = None
+        self.remaining = 0
+        self.will_close = False
+
+    @property
+    def done(self):
+        return self.state == 'done'
+
+    def feed(self, data):
+        """Add received data to the buffer"""
+        self.buffer += data
+
+    def feed_eof(self):
+        """Handle the server closing the connection"""
+        if self.state == 'until_close':
+            self.state = 'done'
+        elif self.state != 'done':
+            raise ConnectionError("connection closed before the end of the response")
+
+    def parse_headers(self):
+        """Parse the header block once it has been received, returning whether it has"""
+        if self.state != 'headers':
+            return True
+
+        while True:
+            header_end = _HEADER_END_RE.search(self.buffer)
+            if not header_end:
+                return False
+
+            self.headers = bytes(self.buffer[:header_end.start()])
+            del self.buffer[:header_end.end()]
+
+            self.status_code = parse_status(self.headers) or 200
+            # Interim responses such as 100 Continue are followed by the final one
+            if not 100 <= self.status_code < 200 or self.status_code == 101:
+                break
+
+        self.fields = parse_headers(self.headers)
+        connection = self.fields.get('connection', '').lower()
+        # HTTP/1.0 connections are only persistent when the server asks for it
+        self.will_close = 'close' in connection or (self.headers.startswith(b'HTTP/1.0')
+                                                    and 'keep-alive' not in connection)
+
+        content_length = self.fields.get('content-length')
+        if content_length is not None:
+            # Repeated fields were combined, which is fine as long as they agree
+            lengths = {value.strip() for value in content_length.split(',')}
+            if len(lengths) != 1:
+                raise ValueError(f"conflicting Content-Length values: {content_length}")
+            content_length = lengths.pop()
+
+        if self.method == "HEAD" or self.status_code in (101, 204, 304):
+            self.state = 'done'
+        elif 'chunked' in self.fields.get('transfer-encoding', '').lower():
+            self.state = 'chunk_size'
+        elif content_length is not None:
+            self.remaining = int(content_length)
+            self.state = 'length' if self.remaining else 'done'
+        else:
+            # No framing information, the message ends when the server closes
+            self.state = 'until_close'
+            self.will_close = True
+        return True
+
+    def take(self, size):
+        """Remove and return up to size bytes from the front of the buffer"""
+        with memoryview(self.buffer) as view:
+            data = bytes(view[:size])
+        del self.buffer[:len(data)]
+        return data
+
+    def read_body(self):
+        """Return the body data available in the buffer.
+
+        Returns b'' when more input is needed or the message is complete,
+        which can be told apart with done.
+        """
+        while True:
+            if self.state in ('length', 'chunk_data'):
+                if not self.buffer:
+                    return b''
+                data = self.take(self.remaining)
+                self.remaining -= len(data)
+                if not self.remaining:
+                    self.state = 'done' if self.state == 'length' else 'chunk_end'
+                return data
+
+            elif self.state == 'until_close':
+                return self.take(len(self.buffer))
+
+            elif self.state == 'chunk_size':
+                line_end = self.buffer.find(b'\r\n')
+                if line_end == -1:
+                    return b''
+                # Chunk extensions after ';' are ignored
+                chunk_size = int(self.buffer[:line_end].split(b';', 1)[0], 16)
+                del self.buffer[:line_end + 2]
+                if chunk_size:
+                    self.remaining = chunk_size
+                    self.state = 'chunk_data'
+                else:
+                    self.state = 'trailers'
+
+            elif self.state == 'chunk_end':
+                # Each chunk's data is followed by CRLF
+                if len(self.buffer) < 2:
+                    return b''
+                if self.buffer[:2] != b'\r\n':
+                    raise ValueError("malformed chunked body")
+                del self.buffer[:2]
+                self.state = 'chunk_size'
+
+            elif self.state == 'trailers':
+                # Skip any trailer fields up to the terminating empty line
+                if self.buffer.startswith(b'\r\n'):
+                    trailer_end = 2
+                else:
+                    trailer_end = self.buffer.find(b'\r\n\r\n')
+                    if trailer_end == -1:
+                        return b''
+                    trailer_end += 4
+                del self.buffer[:trailer_end]
+                self.state = 'done'
+
+            else:
+                return b''
+
 
 class HTTPClient:
+    # SSL context shared by all clients, created on first use
+    _ssl_context = None
+    _ssl_context_lock = threading.Lock()
+    # Idle keep-alive sockets shared by all clients, keyed by (host, port, use_ssl)
+    _pool = {}
+    _pool_lock = threading.Lock()
+    # Resolved addresses shared by all clients, keyed by (host, port)
+    _dns_cache = {}
+    _dns_lock = threading.Lock()
+    # Latest TLS session per (host, port, use_ssl), used to resume the next handshake
+    _tls_sessions = {}
+
     def __init__(self):
         self.socket = None
-        self.ssl_context = ssl.create_default_context()
+        self.connection_key = None
+        # Whether the current socket was taken from the pool, and whether it then
+        # turned out to have been closed by the server before answering
+        self.socket_reused = False
+        self.connection_stale = False
+        self.recv_buffer = bytearray(RECV_BUFFER_SIZE)
+        # Created when the first response is cached
         self.cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
-        # Create cache directory if it doesn't exist
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+
+    @property
+    def ssl_context(self):
+        """SSL context, created once per process on first use as loading the CA certificates is slow"""
+        with self._ssl_context_lock:
+            if HTTPClient._ssl_context is None:
+                import ssl
+                context = ssl.create_default_context()
+                context.check_hostname = True
+                context.set_alpn_protocols(['http/1.1'])
+                HTTPClient._ssl_context = context
+        return HTTPClient._ssl_context
 
     def parse_url(self, url):
         if not url.startswith(('http://', 'https://')):
@@ -37,49 +306,162 @@ class HTTPClient:
 
         return protocol, host, path, port
 
-    def connect(self, host, port, use_ssl=True):
-        """Establish connection to host"""
+    def connect(self, host, port, use_ssl=True, use_pool=True):
+        """Establish connection to host, reusing a pooled keep-alive connection if possible"""
+        self.connection_key = (host, port, use_ssl)
+        self.socket_reused = False
+        self.connection_stale = False
+
+        pooled_socket = self.take_pooled_socket(self.connection_key) if use_pool else None
+        if pooled_socket:
+            self.socket = pooled_socket
+            self.socket_reused = True
+            return True
+
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.settimeout(10)
+        # Requests are small and sent in one piece, don't let Nagle's algorithm delay them
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Detect dead peers on connections kept idle in the pool
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
 
         try:
-            self.socket.connect((host, port))
+            self.socket.connect(self.resolve(host, port))
             if use_ssl:
-                self.socket = self.ssl_context.wrap_socket(self.socket, server_hostname=host)
+                # Resuming the previous session with this host skips most of the handshake
+                with self._pool_lock:
+                    session = self._tls_sessions.get(self.connection_key)
+                self.socket = self.ssl_context.wrap_socket(self.socket, server_hostname=host, session=session)
             return True
         except (socket.timeout, socket.error) as e:
             print(f"Connection error: {e}")
             return False
 
+    def resolve(self, host, port):
+        """Resolve host to a socket address, reusing recent lookups"""
+        key = (host, port)
+        with self._dns_lock:
+            cached = self._dns_cache.get(key)
+        if cached and time.time() - cached[1] < DNS_CACHE_TTL:
+            return cached[0]
+
+        address_info = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_STREAM)
+        address = address_info[0][4]
+        with self._dns_lock:
+            self._dns_cache[key] = (address, time.time())
+        return address
+
+    def take_pooled_socket(self, key):
+        """Return an idle pooled socket for key that is still usable, or None"""
+        while True:
+            with self._pool_lock:
+                idle_sockets = self._pool.get(key)
+                if not idle_sockets:
+                    return None
+                pooled_socket, last_used = idle_sockets.pop()
+            if time.time() - last_used < POOL_IDLE_TIMEOUT and self.is_socket_alive(pooled_socket):
+                return pooled_socket
+            pooled_socket.close()
+
+    @staticmethod
+    def is_socket_alive(sock):
+        """Check that an idle socket has not been closed by the server"""
+        try:
+            # An idle connection has nothing to read unless the server closed it
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
     def get_cache_key(self, url, accept_header):
         """Generate a cache key based on URL and content type"""
-        return hashlib.md5(f"{url}_{accept_header}".encode()).hexdigest()
+        import hashlib
+        # The file name only has to tell requests apart, it is not meant to be unpredictable
+        return hashlib.blake2b(f"{url}_{accept_header}".encode(), digest_size=16).hexdigest()
+
+    def get_cache_file(self, url, accept_header):
+        """Return the path the cached response for url is stored under, without its extension"""
+        return os.path.join(self.cache_dir, self.get_cache_key(url, accept_header))
+
+    def read_cached_response(self, cache_file):
+        """Read a cached response as headers bytes and an iterator over its body chunks"""
+        with open(cache_file + '.hdr', 'rb') as f:
+            headers = f.read()
+        return headers, self.iter_file_chunks(cache_file + '.body')
+
+    @staticmethod
+    def iter_file_chunks(path):
+        """Yield the contents of a file in RECV_BUFFER_SIZE chunks"""
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(RECV_BUFFER_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    def cache_body_chunks(self, cache_file, headers, body_chunks):
+        """Pass body chunks through while storing the complete response in the cache"""
+        partial_file = f"{cache_file}.{threading.get_ident()}.part"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_body = open(partial_file, 'wb')
+        except OSError as e:
+            print(f"Warning: Failed to cache response: {e}")
+            yield from body_chunks
+            return
+
+        try:
+            with cache_body:
+                for chunk in body_chunks:
+                    cache_body.write(chunk)
+                    yield chunk
+        except BaseException:
+            # Never keep a body that was not read completely
+            os.remove(partial_file)
+            raise
+
+        partial_headers = f"{cache_file}.{threading.get_ident()}.hdr.part"
+        try:
+            # An entry needs both files to be valid, so drop the old headers before
+            # the new body is installed and put the new headers in place last
+            with open(partial_headers, 'wb') as f:
+                f.write(headers)
+            try:
+                os.remove(cache_file + '.hdr')
+            except FileNotFoundError:
+                pass
+            os.replace(partial_file, cache_file + '.body')
+            os.replace(partial_headers, cache_file + '.hdr')
+        except OSError as e:
+            print(f"Warning: Failed to cache response: {e}")
+            for leftover in (partial_file, partial_headers):
+                try:
+                    os.remove(leftover)
+                except OSError:
+                    pass
 
     def is_cached_response_valid(self, cache_file):
         """Check if a cached response is still valid based on cache control headers"""
-        if not os.path.exists(cache_file):
+        header_file = cache_file + '.hdr'
+        if not os.path.exists(header_file) or not os.path.exists(cache_file + '.body'):
             return False
 
-        try:
-            with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
-                cached_response = f.read()
+        from datetime import datetime
 
-            # Extract headers from cached response
-            headers_part = cached_response.split('\r\n\r\n', 1)[0]
-            if not headers_part:
-                headers_part = cached_response.split('\n\n', 1)[0]
+        try:
+            file_modified_time = os.path.getmtime(header_file)
+            with open(header_file, 'rb') as f:
+                cached_headers = parse_headers(f.read())
 
             # Check for expiration headers
-            max_age_match = re.search(r'Cache-Control:.*?max-age=(\d+)', headers_part, re.IGNORECASE)
+            max_age_match = _MAX_AGE_RE.search(cached_headers.get('cache-control', ''))
             if max_age_match:
                 max_age = int(max_age_match.group(1))
-                file_modified_time = os.path.getmtime(cache_file)
                 if time.time() - file_modified_time > max_age:
                     return False
 
-            expires_match = re.search(r'Expires:\s*(.*?)[\r\n]', headers_part, re.IGNORECASE)
-            if expires_match:
-                expires_str = expires_match.group(1).strip()
+            expires_str = cached_headers.get('expires')
+            if expires_str:
                 try:
                     # Parse the expiration date
                     expires_date = datetime.strptime(expires_str, '%a, %d %b %Y %H:%M:%S %Z')
@@ -90,14 +472,10 @@ class HTTPClient:
                     return False
 
             # Check for conditional headers to use in validation
-            etag_match = re.search(r'ETag:\s*(.*?)[\r\n]', headers_part, re.IGNORECASE)
-            last_modified_match = re.search(r'Last-Modified:\s*(.*?)[\r\n]', headers_part, re.IGNORECASE)
-
-            if etag_match or last_modified_match:
+            if 'etag' in cached_headers or 'last-modified' in cached_headers:
                 return True  # We have validators to use for revalidation
 
             # Default cache lifetime if no explicit expiration
-            file_modified_time = os.path.getmtime(cache_file)
             default_ttl = 3600  # 1 hour
             return (time.time() - file_modified_time) < default_ttl
 
@@ -109,115 +487,251 @@ class HTTPClient:
         """Extract validators from cached response for revalidation"""
         validators = {}
 
-        if not os.path.exists(cache_file):
+        header_file = cache_file + '.hdr'
+        if not os.path.exists(header_file):
             return validators
 
         try:
-            with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
-                cached_response = f.read()
-
-            headers_part = cached_response.split('\r\n\r\n', 1)[0]
-            if not headers_part:
-                headers_part = cached_response.split('\n\n', 1)[0]
+            with open(header_file, 'rb') as f:
+                cached_headers = parse_headers(f.read())
 
-            etag_match = re.search(r'ETag:\s*(.*?)[\r\n]', headers_part, re.IGNORECASE)
-            if etag_match:
-                validators['If-None-Match'] = etag_match.group(1).strip()
+            if 'etag' in cached_headers:
+                validators['If-None-Match'] = cached_headers['etag']
 
-            last_modified_match = re.search(r'Last-Modified:\s*(.*?)[\r\n]', headers_part, re.IGNORECASE)
-            if last_modified_match:
-                validators['If-Modified-Since'] = last_modified_match.group(1).strip()
+            if 'last-modified' in cached_headers:
+                validators['If-Modified-Since'] = cached_headers['last-modified']
 
             return validators
         except Exception as e:
             print(f"Error extracting validators: {e}")
             return validators
 
-    def should_cache_response(self, response_headers):
-        """Determine if a response should be cached based on its headers"""
+    def should_cache_response(self, status_code, response_fields):
+        """Determine if a response should be cached based on its status and parsed headers"""
+        cache_control = response_fields.get('cache-control', '').lower()
+
         # Don't cache responses with Cache-Control: no-store
-        if re.search(r'Cache-Control:.*?no-store', response_headers, re.IGNORECASE):
+        if 'no-store' in cache_control:
             return False
 
         # Don't cache private responses
-        if re.search(r'Cache-Control:.*?private', response_headers, re.IGNORECASE):
+        if 'private' in cache_control:
             return False
 
         # Don't cache if explicitly told not to
-        if re.search(r'Cache-Control:.*?no-cache', response_headers, re.IGNORECASE):
+        if 'no-cache' in cache_control:
             return False
 
         # Default to caching GET responses that are successful
-        status_match = re.search(r'HTTP/[\d.]+\s+(\d+)', response_headers)
-        if status_match and status_match.group(1) == '200':
-            return True
+        return status_code == 200
 
-        return False
-
-    def send_request(self, host, path, method="GET", headers=None, body=None):
-        """Send HTTP request"""
+    def build_request(self, host, path, method="GET", headers=None, body=None):
+        """Build the bytes of an HTTP request"""
         if headers is None:
             headers = {}
 
-        headers.update({
-            "Host": host,
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": headers.get("Accept",
-                                  "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"),
-            "Connection": "close"
-        })
+        headers["Host"] = host
+        # Headers given by the caller take precedence over the defaults
+        for key, value in DEFAULT_HEADERS:
+            headers.setdefault(key, value)
+        if isinstance(body, str):
+            body = body.encode()
+        if body:
+            headers["Content-Length"] = str(len(body))
 
-        request_lines = [f"{method} {path} HTTP/1.1"]
+        # Build the request directly as bytes
+        request = bytearray(f"{method} {path} HTTP/1.1\r\n".encode())
         for key, value in headers.items():
-            request_lines.append(f"{key}: {value}")
-
-        request = "\r\n".join(request_lines) + "\r\n\r\n"
+            request += key.encode()
+            request += b': '
+            request += str(value).encode()
+            request += b'\r\n'
+        request += b'\r\n'
         if body:
             request += body
+        return request
 
+    def send_request(self, host, path, method="GET", headers=None, body=None):
+        """Send HTTP request"""
+        request = self.build_request(host, path, method, headers, body)
         try:
-            self.socket.sendall(request.encode())
+            self.socket.sendall(request)
             return True
         except Exception as e:
-            print(f"Request error: {e}")
+            if self.socket_reused:
+                self.connection_stale = True
+            else:
+                print(f"Request error: {e}")
             return False
 
-    def receive_response(self):
-        """Receive and parse HTTP response"""
-        response = b''
+    def exchange(self, host, port, use_ssl, path, method="GET", headers=None, body=None):
+        """Connect, send a request and receive the response headers.
+
+        A pooled connection may have been closed by the server while it was
+        idle, so if sending on it fails or it closes before any of the response
+        arrives the request is retried once on a new connection. Returns the
+        response as receive_response() does, or None on failure.
+        """
+        for use_pool in (True, False):
+            if not self.connect(host, port, use_ssl, use_pool):
+                return None
+            if not self.send_request(host, path, method, headers, body):
+                self.close()
+                response = None
+            else:
+                response = self.receive_response(method)
+            if not self.connection_stale:
+                return response
+        return None
+
+    def recv_into_buffer(self, sock, buffer):
+        """Append the next block of data from sock to buffer and return its size"""
+        view = memoryview(self.recv_buffer)
+        received = sock.recv_into(view)
+        buffer += view[:received]
+        return received
+
+    def receive_response(self, method="GET"):
+        """Receive HTTP response headers.
+
+        Returns (headers, body_chunks) where headers are the raw header bytes and
+        body_chunks is an iterator over the body that reads it from the socket on
+        demand, or None on failure. The iterator takes over the connection and
+        releases it once the body has been read.
+        """
+        sock, connection_key = self.socket, self.connection_key
+        parser = ResponseParser(method)
         try:
-            while True:
-                data = self.socket.recv(4096)
-                if not data:
-                    break
-                response += data
+            # Read the status line and headers
+            while not parser.parse_headers():
+                if not self.recv_into_buffer(sock, parser.buffer):
+                    self.close()
+                    self.connection_stale = self.socket_reused and not parser.buffer
+                    return (bytes(parser.buffer), iter(())) if parser.buffer else None
+        except Exception as e:
+            self.close()
+            self.connection_stale = self.socket_reused and not parser.buffer
+            if not self.connection_stale:
+                print(f"Response error: {e}")
+            return None
 
-            return response.decode('utf-8', errors='replace')
+        self.socket = None
+        body_chunks = self.iter_body_chunks(sock, connection_key, parser)
+
+        content_encoding = parser.fields.get('content-encoding', '').strip().lower()
+        if content_encoding and content_encoding != 'identity':
+            body_chunks = self.iter_decompressed_body(body_chunks, content_encoding)
+        return parser.headers, body_chunks
+
+    def iter_body_chunks(self, sock, connection_key, parser):
+        """Yield the response body as it arrives, stopping at the end of the message"""
+        reusable = False
+        try:
+            while not parser.done:
+                data = parser.read_body()
+                if data:
+                    yield data
+                elif not parser.done and not self.recv_into_buffer(sock, parser.buffer):
+                    parser.feed_eof()
+
+            reusable = not parser.will_close and not parser.buffer
+        finally:
+            self.release_connection(sock, connection_key, reusable)
+
+    @staticmethod
+    def iter_decompressed_body(body_chunks, content_encoding):
+        """Decompress body chunks according to the response Content-Encoding as they arrive"""
+        if content_encoding in ('gzip', 'x-gzip'):
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif content_encoding == 'deflate':
+            decompressor = zlib.decompressobj()
+        elif content_encoding == 'br' and brotli:
+            decompressor = None
+            brotli_decompressor = brotli.Decompressor()
+        else:
+            # Unknown coding, pass the body through unchanged
+            yield from body_chunks
+            return
+
+        first_chunk = True
+        for chunk in body_chunks:
+            if decompressor is None:
+                data = brotli_decompressor.process(chunk)
+            else:
+                try:
+                    data = decompressor.decompress(chunk)
+                except zlib.error:
+                    if not (first_chunk and content_encoding == 'deflate'):
+                        raise
+                    # Some servers send raw deflate data without the zlib wrapper
+                    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                    data = decompressor.decompress(chunk)
+            first_chunk = False
+            if data:
+                yield data
+
+        if decompressor is not None:
+            data = decompressor.flush()
+            if data:
+                yield data
+
+    @staticmethod
+    def discard_body(body_chunks):
+        """Read and discard a response body so its connection can be reused.
+
+        Returns False if the body could not be read, in which case the
+        connection is closed rather than returned to the pool.
+        """
+        try:
+            for _ in body_chunks:
+                pass
+            return True
         except Exception as e:
             print(f"Response error: {e}")
-            return None
+            body_chunks.close()
+            return False
+
+    def release_connection(self, sock, connection_key, reusable):
+        """Return a connection to the pool when it can be reused, otherwise close it"""
+        # By now the server has sent any session ticket for the connection
+        session = getattr(sock, 'session', None)
+        with self._pool_lock:
+            if session is not None and connection_key:
+                self._tls_sessions[connection_key] = session
+            if reusable and connection_key:
+                self._pool.setdefault(connection_key, []).append((sock, time.time()))
+                return
+        sock.close()
 
     def close(self):
         """Close the connection"""
         if self.socket:
             self.socket.close()
+            self.socket = None
+
     def request(self, url, method="GET", headers=None, body=None, follow_redirects=True, max_redirects=5,
                 use_cache=True):
-        """Make HTTP request and handle redirects with caching and content negotiation"""
+        """Make HTTP request and handle redirects with caching and content negotiation.
+
+        Returns the response as (headers, body_chunks), where headers are the raw
+        header bytes and body_chunks is an iterator over the body, or None on failure.
+        """
         if headers is None:
             headers = {}
 
         protocol, host, path, port = self.parse_url(url)
 
         # Set default Accept header if not provided
-        accept_header = headers.get("Accept", "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8")
+        accept_header = headers.get("Accept", DEFAULT_ACCEPT)
         headers["Accept"] = accept_header
 
-        cache_key = self.get_cache_key(url, accept_header)
-        cache_file = os.path.join(self.cache_dir, cache_key)
+        # Only GET requests are cached, don't hash the key for anything else
+        cache_file = None
+        if method == "GET" and use_cache:
+            cache_file = self.get_cache_file(url, accept_header)
 
         # Check cache for GET requests
-        if method == "GET" and use_cache:
+        if cache_file:
             if self.is_cached_response_valid(cache_file):
                 print(f"Using cached response for {url}")
 
@@ -228,187 +742,337 @@ class HTTPClient:
                     headers.update(validators)
 
                     # Make conditional request
-                    if not self.connect(host, port, use_ssl=(protocol == 'https')):
-                        print("Connection failed, using cached response")
-                        with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
-                            return f.read()
-
-                    if not self.send_request(host, path, method, headers, body):
-                        self.close()
+                    response = self.exchange(host, port, protocol == 'https', path, method, headers, body)
+                    if not response:
                         print("Request failed, using cached response")
-                        with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
-                            return f.read()
-
-                    response = self.receive_response()
-                    self.close()
-
-                    if response:
-                        status_match = re.search(r'HTTP/[\d.]+\s+(\d+)', response)
-                        if status_match and status_match.group(1) == '304':  # Not Modified
-                            print("Resource not modified, using cached version")
-                            with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
-                                return f.read()
-                        else:
-                            # Update cache with new response
-                            if self.should_cache_response(response.split('\r\n\r\n', 1)[0]):
-                                try:
-                                    with open(cache_file, 'w', encoding='utf-8') as f:
-                                        f.write(response)
-                                except Exception as e:
-                                    print(f"Warning: Failed to cache response: {e}")
-                            return response
+                        return self.read_cached_response(cache_file)
+
+                    response_headers, body_chunks = response
+                    status_code = parse_status(response_headers)
+                    if status_code == 304:  # Not Modified
+                        # Read the (empty) body so the connection is released
+                        self.discard_body(body_chunks)
+                        print("Resource not modified, using cached version")
+                        return self.read_cached_response(cache_file)
+                    else:
+                        # Update cache with new response
+                        if self.should_cache_response(status_code, parse_headers(response_headers)):
+                            body_chunks = self.cache_body_chunks(cache_file, response_headers, body_chunks)
+                        return response_headers, body_chunks
                 else:
                     # No validators, but cache is still valid
-                    with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
-                        return f.read()
+                    return self.read_cached_response(cache_file)
 
         # No valid cache, make a new request
-        if not self.connect(host, port, use_ssl=(protocol == 'https')):
-            return None
-
-        if not self.send_request(host, path, method, headers, body):
-            self.close()
-            return None
-
-        response = self.receive_response()
-        self.close()
-
+        response = self.exchange(host, port, protocol == 'https', path, method, headers, body)
         if not response:
             return None
+        response_headers, body_chunks = response
+
+        # Parse the status and headers once for all the checks below
+        status_code = parse_status(response_headers)
+        response_fields = parse_headers(response_headers)
 
         # Check HTTP status code
-        status_match = re.search(r'HTTP/[\d.]+\s+(\d+)', response)
-        if status_match:
-            status_code = status_match.group(1)
-            if status_code.startswith('4') or status_code.startswith('5'):
-                print(f"Server returned error status: {status_code}")
-                # Continue processing as response may contain error details
-
-        # Cache the response if appropriate
-        if method == "GET" and use_cache and self.should_cache_response(response.split('\r\n\r\n', 1)[0]):
-            try:
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    f.write(response)
-            except Exception as e:
-                print(f"Warning: Failed to cache response: {e}")
+        if status_code and status_code >= 400:
+            print(f"Server returned error status: {status_code}")
+            # Continue processing as response may contain error details
 
         # Handle redirects
         if follow_redirects and max_redirects > 0:
-            status_match = re.search(r'HTTP/[\d.]+\s+(\d+)', response)
-            if status_match and status_match.group(1) in ('301', '302', '303', '307', '308'):
-                location_match = re.search(r'Location:\s*(.*?)[\r\n]', response, re.IGNORECASE)
-                if location_match:
-                    redirect_url = location_match.group(1).strip()
+            if status_code in (301, 302, 303, 307, 308):
+                redirect_url = response_fields.get('location')
+                if redirect_url:
                     if not redirect_url.startswith(('http://', 'https://')):
                         redirect_url = f"{protocol}://{host}{redirect_url}"
 
+                    # Read the redirect body so the connection can be reused
+                    self.discard_body(body_chunks)
+
                     print(f"Redirecting to: {redirect_url}")
 
                     return self.request(redirect_url, method, headers, body, follow_redirects, max_redirects - 1, use_cache)
-        return response
 
+        # Cache the response if appropriate, as its body is read
+        if cache_file and self.should_cache_response(status_code, response_fields):
+            body_chunks = self.cache_body_chunks(cache_file, response_headers, body_chunks)
+
+        return response_headers, body_chunks
+
+    def pipeline(self, urls, headers=None):
+        """Fetch several URLs from the same host over one connection using HTTP pipelining.
+
+        Every request is written without waiting for the earlier responses, which
+        are then read back in order. If the server closes the connection early,
+        for example after answering with Connection: close, the unanswered URLs
+        are requested again on a new connection. Redirects are not followed and
+        the cache is not used.
+
+        Returns a list with the response for each URL as a (headers, body) tuple
+        of bytes, or None where it could not be fetched.
+        """
+        targets = [self.parse_url(url) for url in urls]
+        if not targets:
+            return []
+        protocol, host, _, port = targets[0]
+        if any((target[0], target[1], target[3]) != (protocol, host, port) for target in targets):
+            raise ValueError("Pipelined URLs must share the same scheme, host and port")
+
+        responses = []
+        paths = [target[2] for target in targets]
+        use_pool = True
+        while len(responses) < len(paths):
+            answered = len(responses)
+            if self.connect(host, port, protocol == 'https', use_pool):
+                try:
+                    self.exchange_pipelined(host, paths[answered:], responses, headers)
+                except Exception as e:
+                    # Responses read before the error are already in the list
+                    if len(responses) > answered or not self.socket_reused:
+                        print(f"Response error: {e}")
+            if len(responses) == answered and self.socket_reused:
+                # The pooled connection had been closed by the server, retry on a new one
+                use_pool = False
+            elif len(responses) == answered:
+                # The server could not answer any of the remaining requests
+                responses.extend([None] * (len(paths) - answered))
+        return responses
+
+    def exchange_pipelined(self, host, paths, responses, headers=None):
+        """Write a GET request for each path on the current connection and read the responses.
+
+        Each response is appended to responses as a (headers, body) tuple as
+        soon as its framing is complete, in request order, or as None if its
+        body could not be decoded. A response cut short by the connection
+        closing is not appended. Stops when every path has been answered or
+        the connection is closed.
+        """
+        import selectors
+
+        sock, connection_key = self.socket, self.connection_key
+        self.socket = None
+        outgoing = memoryview(b''.join(
+            self.build_request(host, path, "GET", dict(headers or {})) for path in paths))
+        sent = 0
+
+        # Reads and writes that can't proceed yet on a non-blocking (SSL) socket
+        retry_errors = (BlockingIOError, InterruptedError)
+        if connection_key[2]:
+            import ssl
+            retry_errors += (ssl.SSLWantReadError, ssl.SSLWantWriteError)
+
+        answered = 0
+        parser = ResponseParser("GET")
+        body = bytearray()
+        connection_open = True
+        selector = selectors.DefaultSelector()
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ | selectors.EVENT_WRITE)
+        try:
+            while connection_open and answered < len(paths):
+                events = selector.select(timeout=10)
+                if not events:
+                    raise TimeoutError("timed out waiting for pipelined responses")
+                _, mask = events[0]
+
+                # Keep writing the remaining requests while responses come in
+                if mask & selectors.EVENT_WRITE and sent < len(outgoing):
+                    try:
+                        sent += sock.send(outgoing[sent:])
+                    except retry_errors:
+                        pass
+                    if sent == len(outgoing):
+                        selector.modify(sock, selectors.EVENT_READ)
+
+                if mask & selectors.EVENT_READ:
+                    # Read everything available, including data the SSL layer has buffered
+                    while True:
+                        try:
+                            received = self.recv_into_buffer(sock, parser.buffer)
+                        except retry_errors:
+                            break
+                        if not received:
+                            connection_open = False
+                            break
+
+                # Hand out every response that is now complete
+                while answered < len(paths):
+                    if not parser.parse_headers():
+                        break
+                    data = parser.read_body()
+                    if data:
+                        body += data
+                        continue
+                    if not parser.done and not connection_open:
+                        # Only once the buffer is drained does the close end the message
+                        try:
+                            parser.feed_eof()
+                        except ConnectionError:
+                            break
+                    if not parser.done:
+                        break
+
+                    body_chunks = iter((bytes(body),))
+                    content_encoding = parser.fields.get('content-encoding', '').strip().lower()
+                    if content_encoding and content_encoding != 'identity':
+                        body_chunks = self.iter_decompressed_body(body_chunks, content_encoding)
+                    try:
+                        responses.append((parser.headers, b''.join(body_chunks)))
+                    except Exception as e:
+                        # Only this response is lost, the framing of the next one is intact
+                        print(f"Response error: {e}")
+                        responses.append(None)
+                    answered += 1
+
+                    if parser.will_close:
+                        # The server won't answer the rest on this connection
+                        connection_open = False
+                        break
+                    parser = ResponseParser("GET", parser.buffer)
+                    body = bytearray()
+        finally:
+            selector.close()
+            sock.settimeout(10)
+            reusable = connection_open and answered == len(paths) and not parser.buffer
+            self.release_connection(sock, connection_key, reusable)
+
+
+def iter_html_text(text_chunks):
+    """Strip markup from pieces of an HTML document, yielding the text as it becomes available.
+
+    Markup is removed with the precompiled regexes, only over the part of the
+    buffer that ends outside any markup. An unfinished tag, or a <head>,
+    <script> or <style> element whose end tag hasn't arrived yet, is carried
+    over to the next piece, and only the newly received text is searched for
+    its end. So is a character reference that may not be complete yet.
+    """
+    pending = ''
+    # What the unfinished markup at the start of pending is waiting for, and
+    # where in pending to continue looking for it
+    waiting_for = None
+    resume = 0
+    for text in text_chunks:
+        pending += text
+        if waiting_for is not None:
+            if not waiting_for.search(pending, resume):
+                # Only the text from the last '<' on could still be part of a match
+                last_open = pending.rfind('<', resume)
+                resume = last_open if last_open != -1 else len(pending)
+                continue
+            waiting_for = None
+
+        position = _COMPLETE_MARKUP_RE.match(pending).end()
+        if position < len(pending):
+            # Stopped at markup that isn't complete yet
+            start_tag = _RAW_TEXT_START_RE.match(pending, position)
+            if start_tag:
+                waiting_for = _RAW_TEXT_END_RES[start_tag.group(1).lower()]
+                resume = start_tag.end() - position
+            else:
+                waiting_for = _TAG_END_RE
+                resume = 1
+        else:
+            entity_start = pending.rfind('&')
+            if entity_start != -1 and _PARTIAL_ENTITY_RE.fullmatch(pending, entity_start):
+                position = entity_start
 
-def extract_html_content(response):
-    """Extract HTML body from response and clean it"""
-    # Check if response is empty
-    if not response:
-        return "Empty response received."
-
-    # Split headers and body
-    parts = response.split('\r\n\r\n', 1)
-    if len(parts) < 2:
-        # Try alternative delimiter
-        parts = response.split('\n\n', 1)
-        if len(parts) < 2:
-            return "No content found in response."
+        if position:
+            yield html.unescape(_MARKUP_RE.sub(' ', pending[:position]))
+            pending = pending[position:]
 
-    body = parts[1]
-    headers = parts[0]
+    # The document is complete, so strip whatever markup is left as it is
+    if pending:
+        yield html.unescape(_MARKUP_RE.sub(' ', pending))
 
+
+def extract_html_content(headers, body_chunks):
+    """Extract content from response headers and an iterable of body chunks and clean it"""
     # Check content type
-    content_type_match = re.search(r'Content-Type:\s*(.*?)[\r\n]', headers, re.IGNORECASE)
-    content_type = content_type_match.group(1).lower() if content_type_match else ""
+    content_type = parse_headers(headers).get('content-type', '').lower()
 
-    if "application/json" in content_type:
+    if "application/json" in content_type or "text/plain" in content_type:
+        body = b''.join(body_chunks)
+        if not body:
+            return "No content found in response."
+
+        if "text/plain" in content_type:
+            return body.decode('utf-8', errors='replace')  # Return plain text as is
         try:
             # Parse and pretty-print JSON
             parsed_json = json.loads(body)
             return json.dumps(parsed_json, indent=2)
         except json.JSONDecodeError:
             return "Invalid JSON content received."
-    elif "text/plain" in content_type:
-        return body  # Return plain text as is
     else:
-        # Process as HTML
-        clean_text = re.sub(r'<head>.*?</head>', '', body, flags=re.DOTALL)
-        clean_text = re.sub(r'<script.*?>.*?</script>', '', clean_text, flags=re.DOTALL)
-        clean_text = re.sub(r'<style.*?>.*?</style>', '', clean_text, flags=re.DOTALL)
-        clean_text = re.sub(r'<.*?>', ' ', clean_text)
-
-        # Decode HTML entities
-        clean_text = html.unescape(clean_text)
-
-        # Replace multiple spaces and newlines
-        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+        # Process as HTML, decoding and stripping each chunk as it arrives
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        empty = True
+
+        def text_chunks():
+            nonlocal empty
+            for chunk in body_chunks:
+                empty = empty and not chunk
+                yield decoder.decode(chunk)
+            yield decoder.decode(b'', final=True)
+
+        clean_text = ''.join(iter_html_text(text_chunks()))
+        if empty:
+            return "No content found in response."
 
-        return clean_text
+        # str.split() without arguments splits on any whitespace run in C,
+        # which is much faster than a regex substitution over the whole text
+        return ' '.join(clean_text.split())
 
 
-def extract_search_results(response, search_engine):
+def extract_search_results(headers, body, search_engine):
     """Extract and parse search results based on the search engine"""
+    body = body.decode('utf-8', errors='replace')
+
     if search_engine == "duckduckgo":
         # Debug response to file for troubleshooting
         print("=== DEBUGGING DUCKDUCKGO RESPONSE ===")
-        header_part = response.split('\r\n\r\n', 1)[0]
-        if not header_part:
-            header_part = response.split('\n\n', 1)[0]
-        print(header_part[:1000])  # Print first 1000 chars of headers
+        print(headers[:1000].decode('latin-1'))  # Print first 1000 chars of headers
         print("================================")
 
-        # Extract organic search results
-        results = []
+        # Extract organic search results, writing each one out as it is found
+        output = io.StringIO()
+        result_count = 0
 
         # DuckDuckGo uses JavaScript to load results, but we can try to find links in the initial HTML
-        links = re.findall(r'<a.*?href="(https?://(?!duckduckgo\.com).*?)".*?>(.*?)</a>', response, re.DOTALL)
-
         seen_urls = set()
-        for url, title in links:
+        for link_match in _DDG_LINK_RE.finditer(body):
+            url, title = link_match.groups()
             # Skip duplicates and internal links
             if url in seen_urls or 'duckduckgo.com' in url or not url.startswith(('http://', 'https://')):
                 continue
 
             # Clean the title
-            clean_title = re.sub(r'<.*?>', '', title)
-            clean_title = html.unescape(clean_title).strip()
+            clean_title = html.unescape(_TAG_RE.sub('', title)).strip()
 
             if clean_title and len(clean_title) > 5:  # Avoid very short or empty titles
-                results.append({'title': clean_title, 'url': url})
+                result_count += 1
+                output.write(f"{result_count}. {clean_title}\n   URL: {url}\n\n")
                 seen_urls.add(url)
 
-                if len(results) >= 10:
+                if result_count >= 10:
                     break
 
-        if not results:
+        if not result_count:
             return "No results found. Please check your query or DuckDuckGo's page structure."
 
-        output = []
-        for i, result in enumerate(results, 1):
-            output.append(f"{i}. {result['title']}\n   URL: {result['url']}")
-
-        return "\n\n".join(output)
+        return output.getvalue().rstrip()
 
     elif search_engine == "google":
-        results = []
+        output = io.StringIO()
 
         # Try to extract Google search results
-        links = re.findall(r'<a href="(/url\?q=|)(https?://(?!google\.com).*?)(?:&amp;|")', response)
-        titles = re.findall(r'<h3.*?>(.*?)</h3>', response)
+        titles = _GOOGLE_TITLE_RE.findall(body)
 
         seen_urls = set()
         result_count = 0
 
-        for link_match in links:
-            url = link_match[1]
+        for link_match in _GOOGLE_LINK_RE.finditer(body):
+            url = link_match.group(2)
             if '&' in url:
                 url = url.split('&')[0]
 
@@ -418,34 +1082,27 @@ def extract_search_results(response, search_engine):
             # Try to find a corresponding title
             title = f"Result {result_count + 1}"
             if result_count < len(titles):
-                clean_title = re.sub(r'<.*?>', '', titles[result_count])
-                clean_title = html.unescape(clean_title).strip()
+                clean_title = html.unescape(_TAG_RE.sub('', titles[result_count])).strip()
                 if clean_title:
                     title = clean_title
 
-            results.append({'title': title, 'url': url})
-            seen_urls.add(url)
             result_count += 1
+            output.write(f"{result_count}. {title}\n   URL: {url}\n\n")
+            seen_urls.add(url)
 
             if result_count >= 10:
                 break
 
-        if not results:
+        if not result_count:
             return "No results found. Please check your query or Google's page structure."
 
-        output = []
-        for i, result in enumerate(results, 1):
-            output.append(f"{i}. {result['title']}\n   URL: {result['url']}")
-
-        return "\n\n".join(output)
+        return output.getvalue().rstrip()
 
     return "Unsupported search engine."
 
 
-def fetch_url(url, content_type=None, use_cache=True):
-    """Fetch content from specified URL with content negotiation"""
-    client = HTTPClient()
-
+def accept_headers(content_type):
+    """Return the request headers used to negotiate the given content type"""
     headers = {}
     if content_type:
         if content_type.lower() == "json":
@@ -454,13 +1111,89 @@ def fetch_url(url, content_type=None, use_cache=True):
             headers["Accept"] = "text/html"
         else:
             print(f"Warning: Unrecognized content type '{content_type}'. Using default.")
+    return headers
+
+
+def fetch_url(url, content_type=None, use_cache=True):
+    """Fetch content from specified URL with content negotiation"""
+    client = HTTPClient()
+
+    headers = accept_headers(content_type)
 
     response = client.request(url, headers=headers, use_cache=use_cache)
 
     if not response:
         return "Failed to fetch URL."
 
-    return extract_html_content(response)
+    headers, body_chunks = response
+    try:
+        return extract_html_content(headers, body_chunks)
+    except Exception as e:
+        # The body is read while it is being extracted
+        print(f"Response error: {e}")
+        return "Failed to fetch URL."
+
+
+def fetch_pipelined(urls, content_type=None, use_cache=True):
+    """Fetch several URLs from the same origin over one pipelined connection, returning their content in order.
+
+    URLs with a valid cached response, redirects and responses that could not
+    be fetched this way are handled one at a time by fetch_url().
+    """
+    client = HTTPClient()
+    headers = accept_headers(content_type)
+    accept_header = headers.setdefault("Accept", DEFAULT_ACCEPT)
+
+    pages = [None] * len(urls)
+    pipelined = [index for index, url in enumerate(urls)
+                 if not (use_cache and client.is_cached_response_valid(client.get_cache_file(url, accept_header)))]
+    responses = client.pipeline([urls[index] for index in pipelined], headers) if len(pipelined) > 1 else []
+
+    for index, response in zip(pipelined, responses):
+        if not response:
+            continue
+        response_headers, body = response
+        status_code = parse_status(response_headers) or 200
+        if 300 <= status_code < 400:
+            # Leave redirects to fetch_url(), which follows them
+            continue
+        if status_code >= 400:
+            print(f"Server returned error status: {status_code}")
+
+        # Only complete responses are handed out by pipeline(), so the body is safe to cache
+        body_chunks = iter((body,))
+        if use_cache and client.should_cache_response(status_code, parse_headers(response_headers)):
+            cache_file = client.get_cache_file(urls[index], accept_header)
+            body_chunks = client.cache_body_chunks(cache_file, response_headers, body_chunks)
+        try:
+            pages[index] = extract_html_content(response_headers, body_chunks)
+        except Exception as e:
+            print(f"Response error: {e}")
+
+    return [page if page is not None else fetch_url(url, content_type, use_cache) for url, page in zip(urls, pages)]
+
+
+def fetch_many(urls, content_type=None, use_cache=True, concurrency=FETCH_CONCURRENCY):
+    """Fetch several URLs concurrently, returning their content in the same order.
+
+    URLs that share a scheme, host and port are pipelined over one connection.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = HTTPClient()
+    origins = {}
+    for index, url in enumerate(urls):
+        protocol, host, _, port = client.parse_url(url)
+        origins.setdefault((protocol, host, port), []).append(index)
+
+    pages = [None] * len(urls)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(fetch_pipelined, [urls[index] for index in indexes], content_type, use_cache):
+                   indexes for indexes in origins.values()}
+        for future, indexes in futures.items():
+            for index, page in zip(indexes, future.result()):
+                pages[index] = page
+    return pages
 
 
 def search(term, engine="duckduckgo"):
@@ -486,7 +1219,14 @@ def search(term, engine="duckduckgo"):
     if not response:
         return "Failed to get search results."
 
-    return extract_search_results(response, engine)
+    headers, body_chunks = response
+    try:
+        body = b''.join(body_chunks)
+    except Exception as e:
+        print(f"Response error: {e}")
+        return "Failed to get search results."
+
+    return extract_search_results(headers, body, engine)
 
 
 def open_result(result_number, search_results):
@@ -494,7 +1234,7 @@ def open_result(result_number, search_results):
     lines = search_results.strip().split('\n\n')
     if 0 < result_number <= len(lines):
         result = lines[result_number - 1]
-        url_match = re.search(r'URL: (https?://.*?)$', result, re.MULTILINE)
+        url_match = _RESULT_URL_RE.search(result)
         if url_match:
             url = url_match.group(1)
             return fetch_url(url)
@@ -504,13 +1244,39 @@ def open_result(result_number, search_results):
         return f"Invalid result number. Please specify a number between 1 and {len(lines)}."
 
 
+def open_all_results(search_results):
+    """Open every search result, fetching the pages concurrently"""
+    urls = []
+    for result in search_results.strip().split('\n\n'):
+        url_match = _RESULT_URL_RE.search(result)
+        if url_match:
+            urls.append(url_match.group(1))
+
+    if not urls:
+        return "Could not find any URLs in the search results."
+
+    pages = fetch_many(urls)
+    return "\n\n".join(f"=== {i}. {url} ===\n{page}" for i, (url, page) in enumerate(zip(urls, pages), 1))
+
+
+def result_number(value):
+    """Parse the -o argument, which is either a result number or 'all'"""
+    if value == 'all':
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid result number: '{value}'")
+
+
 def create_parser():
     """Create command line argument parser"""
     parser = argparse.ArgumentParser(prog='go2web', description='Web request and search tool')
     group = parser.add_mutually_exclusive_group()
     group.add_argument('-u', '--url', help='Make an HTTP request to the specified URL')
     group.add_argument('-s', '--search', help='Search the term using DuckDuckGo and print top 10 results')
-    group.add_argument('-o', '--open', type=int, help='Open the specified search result')
+    group.add_argument('-o', '--open', type=result_number,
+                       help="Open the specified search result, or 'all' to open every result")
     parser.add_argument('-t', '--type', choices=['html', 'json'], help='Specify content type for content negotiation')
     parser.add_argument('--no-cache', action='store_true', help='Disable HTTP caching for this request')
     parser.add_argument('--clear-cache', action='store_true', help='Clear all cached responses')
@@ -551,7 +1317,10 @@ def main():
         if os.path.exists(last_search_file):
             with open(last_search_file, 'r', encoding='utf-8') as f:
                 last_search = f.read()
-            result = open_result(args.open, last_search)
+            if args.open == 'all':
+                result = open_all_results(last_search)
+            else:
+                result = open_result(args.open, last_search)
             print(result)
         else:
             print("No previous search results found. Please run a search first using the -s option.")
@@ -0,0 +1,260 @@
+import contextlib
+import html
+import io
+import os
+import random
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from urllib.parse import urlparse
+
+import go2web
+
+
+class ScriptedServer:
+    """Local TCP server that answers each connection with a fixed script.
+
+    Each script is a list of byte strings sent in order with a short pause in
+    between, after which the connection is closed. Connections beyond the
+    number of scripts get the last one.
+    """
+
+    def __init__(self, *scripts):
+        self.scripts = scripts
+        self.connections = 0
+        self.listener = socket.create_server(('127.0.0.1', 0))
+        self.port = self.listener.getsockname()[1]
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return
+            script = self.scripts[min(self.connections, len(self.scripts) - 1)]
+            self.connections += 1
+            with conn:
+                conn.recv(65536)
+                for data in script:
+                    time.sleep(0.05)
+                    conn.sendall(data)
+
+    def close(self):
+        self.listener.close()
+
+
+class ResponseParserTest(unittest.TestCase):
+
+    @staticmethod
+    def parse(data):
+        parser = go2web.ResponseParser("GET", data)
+        if not parser.parse_headers():
+            return parser, None
+        body = bytearray()
+        while not parser.done:
+            chunk = parser.read_body()
+            if not chunk:
+                break
+            body += chunk
+        return parser, bytes(body)
+
+    def test_interim_response_is_skipped(self):
+        parser, body = self.parse(b'HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok')
+        self.assertEqual((parser.status_code, body, parser.done), (200, b'ok', True))
+
+    def test_bare_lf_line_endings(self):
+        parser, body = self.parse(b'HTTP/1.1 200 OK\nContent-Type: text/plain\nContent-Length: 2\n\nok')
+        self.assertEqual(parser.fields, {'content-type': 'text/plain', 'content-length': '2'})
+        self.assertEqual((body, parser.done), (b'ok', True))
+
+    def test_http_1_0_closes_without_keep_alive(self):
+        parser, _ = self.parse(b'HTTP/1.0 200 OK\r\nContent-Length: 0\r\n\r\n')
+        self.assertTrue(parser.will_close)
+        parser, _ = self.parse(b'HTTP/1.0 200 OK\r\nConnection: keep-alive\r\nContent-Length: 0\r\n\r\n')
+        self.assertFalse(parser.will_close)
+        parser, _ = self.parse(b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n')
+        self.assertFalse(parser.will_close)
+
+    def test_repeated_content_length(self):
+        parser, body = self.parse(b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\nContent-Length: 3\r\n\r\nabcdef')
+        self.assertEqual((body, bytes(parser.buffer)), (b'abc', b'def'))
+        with self.assertRaises(ValueError):
+            self.parse(b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\nContent-Length: 4\r\n\r\nabcdef')
+
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = go2web.HTTPClient()
+        self.client.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.client.cache_dir)
+        self.cache_file = self.client.get_cache_file('http://example.com/', 'text/html')
+        with open(self.cache_file + '.hdr', 'wb') as f:
+            f.write(b'HTTP/1.1 200 OK\r\nETag: "old"')
+        with open(self.cache_file + '.body', 'wb') as f:
+            f.write(b'old body')
+
+    def refresh(self):
+        body = b''.join(self.client.cache_body_chunks(self.cache_file, b'HTTP/1.1 200 OK\r\nETag: "new"',
+                                                      iter((b'new ', b'body'))))
+        self.assertEqual(body, b'new body')
+
+    def test_refresh_replaces_headers_and_body(self):
+        self.refresh()
+        headers, body_chunks = self.client.read_cached_response(self.cache_file)
+        self.assertEqual((headers, b''.join(body_chunks)), (b'HTTP/1.1 200 OK\r\nETag: "new"', b'new body'))
+
+    def test_failed_header_write_leaves_no_valid_entry(self):
+        original_replace = os.replace
+
+        def replace(source, destination):
+            if destination.endswith('.hdr'):
+                raise OSError("disk full")
+            original_replace(source, destination)
+
+        with mock.patch.object(go2web.os, 'replace', replace), contextlib.redirect_stdout(io.StringIO()):
+            self.refresh()
+
+        # The new body must never be served with the old validators
+        self.assertFalse(self.client.is_cached_response_valid(self.cache_file))
+        self.assertEqual(sorted(os.listdir(self.client.cache_dir)), [os.path.basename(self.cache_file) + '.body'])
+
+
+class PipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        go2web.HTTPClient._pool.clear()
+
+    def tearDown(self):
+        go2web.HTTPClient._pool.clear()
+
+    def exchange(self, server, paths):
+        client = go2web.HTTPClient()
+        self.assertTrue(client.connect('127.0.0.1', server.port, use_ssl=False))
+        responses = []
+        client.exchange_pipelined('127.0.0.1', paths, responses)
+        return responses
+
+    def test_close_delimited_body_at_end_of_pipeline(self):
+        server = ScriptedServer([
+            b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nfirst',
+            b'HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n\r\n',
+            b'second body until close',
+        ])
+        self.addCleanup(server.close)
+
+        responses = self.exchange(server, ['/a', '/b'])
+
+        self.assertEqual([body for _, body in responses], [b'first', b'second body until close'])
+
+    def test_truncated_body_at_end_of_pipeline_is_not_answered(self):
+        server = ScriptedServer([
+            b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nfirst',
+            b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n',
+            b'short',
+        ])
+        self.addCleanup(server.close)
+
+        responses = self.exchange(server, ['/a', '/b'])
+
+        self.assertEqual([body for _, body in responses], [b'first'])
+
+    def fetch_many(self, server, urls):
+        """Run fetch_many() against server with a temporary cache, returning the pages and cache files"""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        original_init = go2web.HTTPClient.__init__
+
+        def init(client):
+            original_init(client)
+            client.cache_dir = cache_dir
+
+        def parse_url(client, url):
+            return 'http', '127.0.0.1', urlparse(url).path, server.port
+
+        with mock.patch.object(go2web.HTTPClient, '__init__', init), \
+                mock.patch.object(go2web.HTTPClient, 'parse_url', parse_url), \
+                contextlib.redirect_stdout(io.StringIO()):
+            pages = go2web.fetch_many(urls, content_type='html')
+            client = go2web.HTTPClient()
+            cache_files = [client.get_cache_file(url, 'text/html') for url in urls]
+        return pages, cache_files
+
+    def test_fetch_many_caches_complete_close_delimited_body(self):
+        server = ScriptedServer([
+            b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nfirst',
+            b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n\r\n',
+            b'<p>second body</p>',
+        ])
+        self.addCleanup(server.close)
+
+        pages, cache_files = self.fetch_many(server, ['http://127.0.0.1/a', 'http://127.0.0.1/b'])
+
+        self.assertEqual(pages, ['first', 'second body'])
+        with open(cache_files[1] + '.body', 'rb') as f:
+            self.assertEqual(f.read(), b'<p>second body</p>')
+
+    def test_fetch_many_does_not_cache_truncated_response(self):
+        server = ScriptedServer(
+            [b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nfirst',
+             b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n',
+             b'short'],
+            [b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\nshort'],
+        )
+        self.addCleanup(server.close)
+
+        pages, cache_files = self.fetch_many(server, ['http://127.0.0.1/a', 'http://127.0.0.1/b'])
+
+        self.assertEqual(pages, ['first', 'Failed to fetch URL.'])
+        self.assertTrue(os.path.exists(cache_files[0] + '.hdr'))
+        self.assertFalse(os.path.exists(cache_files[1] + '.hdr'))
+        self.assertFalse(os.path.exists(cache_files[1] + '.body'))
+
+
+class HTMLTextTest(unittest.TestCase):
+
+    FRAGMENTS = (
+        '<p>', '</p>', 'text ', '&amp;', '&eacute;', '&#233;', '&not', 'AT&T', ' a < b ', ' c > d ', '<>', '\n',
+        '<script>if (a<b) x="</p>";</script>', '<SCRIPT type="x">var s = "<b>";</SCRIPT >', '<style>p{}</style>',
+        '<head><title>t</title></head>', '<header>h</header>', '<a href="?a=1&b=2">l</a>', '<head>', 'caf\u00e9',
+    )
+
+    @staticmethod
+    def strip_whole(document):
+        return html.unescape(go2web._MARKUP_RE.sub(' ', document))
+
+    @staticmethod
+    def strip_pieces(document, size):
+        return ''.join(go2web.iter_html_text(document[i:i + size] for i in range(0, len(document), size)))
+
+    def test_pieces_give_same_text_as_whole_document(self):
+        generator = random.Random(0)
+        for _ in range(500):
+            document = ''.join(generator.choice(self.FRAGMENTS) for _ in range(generator.randint(0, 30)))
+            for size in (1, 3, 16):
+                self.assertEqual(self.strip_pieces(document, size), self.strip_whole(document), document)
+
+    def test_large_script_in_small_pieces_is_linear(self):
+        document = '<p>a</p><script>' + 'var x = 1 < 2 && "&amp;";\n' * 160000 + '</script><p>b</p>'
+
+        start = time.perf_counter()
+        expected = self.strip_whole(document)
+        whole_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        text = self.strip_pieces(document, 4096)
+        pieces_time = time.perf_counter() - start
+
+        self.assertEqual(text, expected)
+        # Rescanning the open element for every piece takes tens of seconds here
+        self.assertLess(pieces_time, max(1.0, 20 * whole_time))
+
+
+if __name__ == '__main__':
+    unittest.main()